@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Checksums
+SHA-256 helpers shared by the converters, the image cache and the release bundle
+"""
+
+import hashlib
+import mmap
+import os
+from pathlib import Path
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+SOURCE_ENCODINGS = ('utf-8', 'latin-1', 'cp1252', 'iso-8859-1')
+
+
+def hash_file(file_path):
+    """SHA-256 of a file, memory-mapped so large files are never read whole"""
+
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return digest.hexdigest()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for offset in range(0, len(mapped), HASH_CHUNK_SIZE):
+                digest.update(mapped[offset:offset + HASH_CHUNK_SIZE])
+    return digest.hexdigest()
+
+
+def read_source(file_path, encodings=SOURCE_ENCODINGS):
+    """Read a text source once, returning (text, SHA-256 of its bytes)
+
+    Decodes with the first encoding that works and translates newlines like a
+    text-mode read, so the converters see exactly what open() gave them before.
+    """
+
+    data = Path(file_path).read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+
+    for encoding in encodings:
+        try:
+            text = data.decode(encoding)
+            break
+        except UnicodeDecodeError:
+            continue
+    else:
+        text = data.decode('utf-8', errors='ignore')
+
+    return text.replace('\r\n', '\n').replace('\r', '\n'), digest
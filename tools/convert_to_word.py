@@ -4,8 +4,10 @@ Document Converter Script
 Converts Markdown and Text files to Word documents (.docx)
 """
 
+import argparse
 import os
 import sys
+import time
 from docx import Document
 from docx.shared import Inches, Pt
 from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
@@ -14,15 +16,46 @@ import markdown
 import re
 from pathlib import Path
 
+from checksums import read_source
+from image_cache import ImageCache, parse_image_line
+from release_bundle import ReleaseBundle
+from reproducible_build import resolve_build_date, normalize_core_properties, document_bytes, write_if_changed
+from terminology import TerminologyNormalizer, load_terminology
+
+# Inline markdown delimiters and the formatting they apply
+INLINE_DELIMITER = re.compile(r'[*`]')
+INLINE_FORMATS = {'**': 'bold', '*': 'italic', '`': 'code'}
+
+# Cell of a table delimiter row, e.g. ---, :---, ---:, :---:
+TABLE_DELIMITER_CELL = re.compile(r':?-+:?')
+
+# Cell separator: a pipe that is not escaped as \|
+TABLE_CELL_SEPARATOR = re.compile(r'(?<!\\)\|')
+
 class DocumentConverter:
     """Convert various document formats to Word documents"""
     
-    def __init__(self, source_folder, output_folder=None):
+    def __init__(self, source_folder, output_folder=None, build_date=None, bundle=None, terminology=None):
         self.source_folder = Path(source_folder)
         self.output_folder = Path(output_folder) if output_folder else self.source_folder / "word_documents"
         
-        # Create output directory if it doesn't exist
-        self.output_folder.mkdir(exist_ok=True)
+        # Fixed (or SOURCE_DATE_EPOCH) date makes builds byte-identical
+        self.build_date = resolve_build_date(build_date)
+        
+        # Optional ReleaseBundle: documents are streamed into it instead of written to disk
+        self.bundle = bundle
+        self.output_sizes = {}
+        
+        # Create output directory if it doesn't exist (bundles write nothing there)
+        if bundle is None:
+            self.output_folder.mkdir(exist_ok=True)
+        
+        # Processed images are shared by every document in the batch
+        cache_root = self.output_folder if bundle is None else bundle.archive_path.parent
+        self.image_cache = ImageCache(cache_root / ".image_cache")
+        
+        # Vendor/product spellings normalized in all body text ({canonical: [variants]})
+        self.terminology = TerminologyNormalizer(terminology)
         
     def convert_all_documents(self):
         """Convert all supported documents in the folder"""
@@ -30,7 +63,7 @@ class DocumentConverter:
         converted_files = []
         
         # Get all files in the source folder
-        for file_path in self.source_folder.iterdir():
+        for file_path in sorted(self.source_folder.iterdir()):
             if file_path.is_file():
                 file_extension = file_path.suffix.lower()
                 
@@ -48,19 +81,12 @@ class DocumentConverter:
     def convert_markdown_to_word(self, markdown_file):
         """Convert Markdown file to Word document"""
         
+        started = time.perf_counter()
         print(f"Converting Markdown file: {markdown_file.name}")
+        self.terminology.begin_document(markdown_file.name)
         
         # Read the markdown content with fallback encoding
-        try:
-            with open(markdown_file, 'r', encoding='utf-8') as f:
-                markdown_content = f.read()
-        except UnicodeDecodeError:
-            try:
-                with open(markdown_file, 'r', encoding='latin-1') as f:
-                    markdown_content = f.read()
-            except UnicodeDecodeError:
-                with open(markdown_file, 'r', encoding='cp1252') as f:
-                    markdown_content = f.read()
+        markdown_content, source_sha256 = read_source(markdown_file, ('utf-8', 'latin-1', 'cp1252'))
         
         # Convert markdown to HTML first
         html_content = markdown.markdown(markdown_content, extensions=['extra', 'codehilite'])
@@ -72,33 +98,25 @@ class DocumentConverter:
         self.setup_document_styles(doc)
         
         # Parse and add content to Word document
-        self.parse_markdown_to_word(markdown_content, doc)
+        self.parse_markdown_to_word(markdown_content, doc, markdown_file.parent)
         
         # Generate output filename
         output_filename = self.output_folder / f"{markdown_file.stem}.docx"
         
         # Save the document
-        doc.save(output_filename)
-        print(f"Saved: {output_filename}")
+        self.save_word_document(doc, output_filename, markdown_file.stem, markdown_file, source_sha256, started)
         
         return output_filename
     
     def convert_text_to_word(self, text_file):
         """Convert plain text file to Word document"""
         
+        started = time.perf_counter()
         print(f"Converting text file: {text_file.name}")
+        self.terminology.begin_document(text_file.name)
         
         # Read the text content with fallback encoding
-        try:
-            with open(text_file, 'r', encoding='utf-8') as f:
-                text_content = f.read()
-        except UnicodeDecodeError:
-            try:
-                with open(text_file, 'r', encoding='latin-1') as f:
-                    text_content = f.read()
-            except UnicodeDecodeError:
-                with open(text_file, 'r', encoding='cp1252') as f:
-                    text_content = f.read()
+        text_content, source_sha256 = read_source(text_file, ('utf-8', 'latin-1', 'cp1252'))
         
         # Create Word document
         doc = Document()
@@ -118,11 +136,35 @@ class DocumentConverter:
         output_filename = self.output_folder / f"{text_file.stem}.docx"
         
         # Save the document
-        doc.save(output_filename)
-        print(f"Saved: {output_filename}")
+        self.save_word_document(doc, output_filename, text_file.stem, text_file, source_sha256, started)
         
         return output_filename
     
+    def save_word_document(self, doc, output_filename, title, source_file, source_sha256, started):
+        """Save document to disk or the release bundle, skipping unchanged outputs"""
+        
+        if self.build_date is not None:
+            normalize_core_properties(doc, self.build_date, title)
+        
+        converted = time.perf_counter()
+        data = document_bytes(doc, self.build_date)
+        timings = {
+            'convert_seconds': converted - started,
+            'serialize_seconds': time.perf_counter() - converted,
+        }
+        self.output_sizes[output_filename] = len(data)
+        
+        if self.bundle is not None:
+            self.bundle.add_document(output_filename.name, data, source_file, source_sha256, timings)
+            print(f"Bundled: {output_filename.name}")
+        elif write_if_changed(output_filename, data, self.build_date):
+            print(f"Saved: {output_filename}")
+        else:
+            print(f"Unchanged: {output_filename}")
+        
+        for (original, replacement), count in sorted(self.terminology.summary(Path(source_file).name).items()):
+            print(f"  Terminology: {original} -> {replacement} ({count})")
+    
     def setup_document_styles(self, doc):
         """Setup document styles and formatting"""
         
@@ -134,9 +176,25 @@ class DocumentConverter:
             section.left_margin = Inches(1)
             section.right_margin = Inches(1)
     
-    def parse_markdown_to_word(self, markdown_content, doc):
+    def resolve_paragraph_styles(self, doc):
+        """Map paragraph style names used by the parsers to style IDs, once per document"""
+        
+        return {name: doc.styles[name].style_id for name in ('List Bullet', 'List Number')}
+    
+    def add_styled_paragraph(self, doc, text, style_id):
+        """Add a paragraph with a style ID from resolve_paragraph_styles"""
+        
+        paragraph = doc.add_paragraph(text)
+        
+        # Assigning paragraph.style scans every style for the default on each call;
+        # writing the already resolved w:pStyle does not
+        paragraph._p.style = style_id
+        return paragraph
+    
+    def parse_markdown_to_word(self, markdown_content, doc, base_path=None):
         """Parse markdown content and add to Word document"""
         
+        styles = self.resolve_paragraph_styles(doc)
         lines = markdown_content.split('\n')
         current_list = None
         code_block = False
@@ -178,7 +236,7 @@ class DocumentConverter:
             # Handle headers
             if line.startswith('#'):
                 level = len(line) - len(line.lstrip('#'))
-                header_text = line.lstrip('#').strip()
+                header_text = self.terminology.normalize(line.lstrip('#').strip())
                 
                 if level <= 3:
                     doc.add_heading(header_text, level=level)
@@ -192,26 +250,37 @@ class DocumentConverter:
                 i += 1
                 continue
             
+            # Handle images
+            image = parse_image_line(line)
+            if image:
+                alt_text, target = image
+                if not self.image_cache.add_picture(doc, target, base_path, alt_text):
+                    para = doc.add_paragraph()
+                    run = para.add_run(alt_text or target)
+                    run.italic = True
+                i += 1
+                continue
+            
             # Handle lists
             if line.startswith(('- ', '* ', '+ ')) or re.match(r'^\d+\.\s', line):
-                list_text = re.sub(r'^[-*+]\s*|^\d+\.\s*', '', line)
-                para = doc.add_paragraph(list_text, style='List Bullet' if line.startswith(('- ', '* ', '+ ')) else 'List Number')
+                list_text = self.terminology.normalize(re.sub(r'^[-*+]\s*|^\d+\.\s*', '', line))
+                para = self.add_styled_paragraph(doc, list_text, styles['List Bullet'] if line.startswith(('- ', '* ', '+ ')) else styles['List Number'])
                 i += 1
                 continue
             
-            # Handle tables (basic support)
-            if '|' in line and not line.startswith('|'):
-                # This might be a table row
-                table_rows = []
-                j = i
+            # Handle tables: a header row must be followed by a delimiter row,
+            # so shell pipelines and CLI examples are not mistaken for tables
+            if '|' in line and i + 1 < len(lines) and self.is_table_delimiter_row(lines[i + 1], line):
+                table_rows = [line]
+                j = i + 2
+                # The table ends at a blank line or a line without a pipe (GFM)
                 while j < len(lines) and '|' in lines[j]:
                     table_rows.append(lines[j])
                     j += 1
                 
-                if len(table_rows) > 1:
-                    self.add_table_to_word(table_rows, doc)
-                    i = j
-                    continue
+                self.add_table_to_word(table_rows, doc)
+                i = j
+                continue
             
             # Handle bold and italic text
             para = doc.add_paragraph()
@@ -222,10 +291,11 @@ class DocumentConverter:
     def parse_text_to_word(self, text_content, doc):
         """Parse plain text content and add to Word document"""
         
+        styles = self.resolve_paragraph_styles(doc)
         lines = text_content.split('\n')
         
         for line in lines:
-            line = line.strip()
+            line = self.terminology.normalize(line.strip())
             
             if not line:
                 doc.add_paragraph()
@@ -243,84 +313,123 @@ class DocumentConverter:
             elif line.startswith(('- ', '* ', '• ')):
                 # List item
                 list_text = line.lstrip('- *• ')
-                doc.add_paragraph(list_text, style='List Bullet')
+                self.add_styled_paragraph(doc, list_text, styles['List Bullet'])
             elif re.match(r'^\d+\.?\s', line):
                 # Numbered list
                 list_text = re.sub(r'^\d+\.?\s*', '', line)
-                doc.add_paragraph(list_text, style='List Number')
+                self.add_styled_paragraph(doc, list_text, styles['List Number'])
             else:
                 # Regular paragraph
                 doc.add_paragraph(line)
     
     def add_formatted_text_to_paragraph(self, text, paragraph):
-        """Add text with markdown formatting to paragraph"""
-        
-        # Simple regex patterns for markdown formatting
-        patterns = [
-            (r'\*\*(.*?)\*\*', 'bold'),
-            (r'\*(.*?)\*', 'italic'),
-            (r'`(.*?)`', 'code')
-        ]
-        
-        current_text = text
-        last_end = 0
-        
-        # Find all formatting matches
-        all_matches = []
-        for pattern, format_type in patterns:
-            matches = re.finditer(pattern, text)
-            for match in matches:
-                all_matches.append((match.start(), match.end(), match.group(1), format_type))
-        
-        # Sort matches by position
-        all_matches.sort(key=lambda x: x[0])
-        
-        # Add text with formatting
-        for start, end, match_text, format_type in all_matches:
-            # Add text before the match
-            if start > last_end:
-                paragraph.add_run(text[last_end:start])
+        """Add text with markdown formatting to paragraph
+        
+        Single left-to-right scan: a delimiter either consumes the text up to
+        its closer or, when no closer exists, is treated as plain text for the
+        rest of the line, so the cost stays linear in the line length.
+        """
+        
+        closable = {'**': True, '*': True, '`': True}
+        plain_start = 0
+        i = 0
+        
+        while True:
+            match = INLINE_DELIMITER.search(text, i)
+            if not match:
+                break
             
-            # Add formatted text
-            run = paragraph.add_run(match_text)
-            if format_type == 'bold':
-                run.bold = True
-            elif format_type == 'italic':
-                run.italic = True
-            elif format_type == 'code':
-                run.font.name = 'Consolas'
-                run.font.size = Pt(9)
+            i = match.start()
+            if text[i] == '`':
+                delimiter = '`'
+            elif text.startswith('**', i):
+                delimiter = '**'
+            else:
+                delimiter = '*'
             
-            last_end = end
+            if closable[delimiter]:
+                end = text.find(delimiter, i + len(delimiter))
+                if end == -1:
+                    # No closer anywhere further on this line
+                    closable[delimiter] = False
+                else:
+                    # Add text before the match
+                    if i > plain_start:
+                        paragraph.add_run(self.terminology.normalize(text[plain_start:i], skip_code_spans=False))
+                    
+                    self.add_formatted_run(paragraph, text[i + len(delimiter):end], INLINE_FORMATS[delimiter])
+                    i = plain_start = end + len(delimiter)
+                    continue
+            
+            i += len(delimiter)
         
         # Add remaining text
-        if last_end < len(text):
-            paragraph.add_run(text[last_end:])
+        if plain_start < len(text):
+            paragraph.add_run(self.terminology.normalize(text[plain_start:], skip_code_spans=False))
+    
+    def add_formatted_run(self, paragraph, text, format_type):
+        """Add a single formatted run to paragraph"""
+        
+        if format_type != 'code':
+            text = self.terminology.normalize(text, skip_code_spans=False)
+        
+        run = paragraph.add_run(text)
+        if format_type == 'bold':
+            run.bold = True
+        elif format_type == 'italic':
+            run.italic = True
+        elif format_type == 'code':
+            run.font.name = 'Consolas'
+            run.font.size = Pt(9)
+    
+    def split_table_row(self, row):
+        """Split a markdown table row into stripped cells (\\| is a literal pipe)"""
+        
+        row = row.strip()
+        if row.startswith('|'):
+            row = row[1:]
+        if row.endswith('|') and not row.endswith('\\|'):
+            row = row[:-1]
+        
+        return [cell.strip().replace('\\|', '|') for cell in TABLE_CELL_SEPARATOR.split(row)]
+    
+    def is_table_delimiter_row(self, row, header_row):
+        """Detect the |---|:---:| row that follows a table header"""
+        
+        if '|' not in row:
+            return False
+        
+        cells = self.split_table_row(row)
+        if len(cells) != len(self.split_table_row(header_row)):
+            return False
+        
+        return all(TABLE_DELIMITER_CELL.fullmatch(cell) for cell in cells)
     
     def add_table_to_word(self, table_rows, doc):
         """Add a table to the Word document"""
         
-        # Parse table rows
+        # Parse table rows, padding or truncating each to the header width (GFM)
+        column_count = len(self.split_table_row(table_rows[0]))
         parsed_rows = []
         for row in table_rows:
-            cells = [cell.strip() for cell in row.split('|') if cell.strip()]
-            if cells:
-                parsed_rows.append(cells)
+            cells = self.split_table_row(row)
+            if any(cells):
+                parsed_rows.append((cells + [''] * column_count)[:column_count])
         
         if not parsed_rows:
             return
         
         # Create table
-        max_cols = max(len(row) for row in parsed_rows)
-        table = doc.add_table(rows=len(parsed_rows), cols=max_cols)
+        table = doc.add_table(rows=len(parsed_rows), cols=column_count)
         table.style = 'Light Grid Accent 1'
         
         # Populate table
-        for i, row_data in enumerate(parsed_rows):
-            row_cells = table.rows[i].cells
+        # Iterate rows once; indexing table.rows rebuilds the row list every time
+        for i, (row, row_data) in enumerate(zip(table.rows, parsed_rows)):
+            row_cells = row.cells
             for j, cell_data in enumerate(row_data):
                 if j < len(row_cells):
-                    row_cells[j].text = cell_data
+                    row_cells[j].text = self.terminology.normalize(cell_data)
                     
                     # Make header row bold
                     if i == 0:
@@ -331,33 +440,57 @@ class DocumentConverter:
 def main():
     """Main conversion function"""
     
+    parser = argparse.ArgumentParser(description="TENDER Documents to Word Converter")
+    parser.add_argument("--bundle", help="Stream all documents into this release archive (.zip) with a manifest")
+    parser.add_argument("--terminology", help="JSON terminology dictionary ({canonical: [variants]})")
+    args = parser.parse_args()
+    
     # Source folder containing documents to convert
     source_folder = "/Users/adiscato/Python/TENDER"
     output_folder = "/Users/adiscato/Python/TENDER/word_documents"
     
     print("=== TENDER Documents to Word Converter ===")
     print(f"Source folder: {source_folder}")
-    print(f"Output folder: {output_folder}")
+    print(f"Output folder: {args.bundle or output_folder}")
     print()
     
-    # Initialize converter
-    converter = DocumentConverter(source_folder, output_folder)
+    bundle = None
     
-    # Convert all documents
     try:
+        # Opened inside the try so a bad --bundle path takes the normal error path
+        bundle = ReleaseBundle(args.bundle, resolve_build_date()) if args.bundle else None
+        
+        # Initialize converter
+        terminology = load_terminology(args.terminology) if args.terminology else None
+        converter = DocumentConverter(source_folder, output_folder, bundle=bundle, terminology=terminology)
+        
+        # Convert all documents
         converted_files = converter.convert_all_documents()
         
+        # Finish the archive (manifest and central directory) before reporting
+        if bundle is not None:
+            bundle.close()
+        
         print("\n=== Conversion Complete ===")
         print(f"Successfully converted {len(converted_files)} files:")
         
         for file_path in converted_files:
             print(f"  - {file_path.name}")
         
-        print(f"\nAll Word documents saved to: {output_folder}")
+        if bundle is not None:
+            print(f"\nAll Word documents bundled into: {bundle.archive_path}")
+        else:
+            print(f"\nAll Word documents saved to: {output_folder}")
+        
+        print(f"Terminology substitutions: {len(converter.terminology.substitutions)}")
         
     except Exception as e:
         print(f"Error during conversion: {str(e)}")
         sys.exit(1)
+    finally:
+        # Always leave a readable archive, even after a failed conversion
+        if bundle is not None:
+            bundle.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -5,8 +5,10 @@ Converts documents from TENDER folder to professional Word documents (.docx)
 with improved formatting and styling
 """
 
+import argparse
 import os
 import sys
+import time
 from docx import Document
 from docx.shared import Inches, Pt, RGBColor
 from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
@@ -17,15 +19,40 @@ import re
 from pathlib import Path
 from datetime import datetime
 
+from checksums import read_source
+from image_cache import ImageCache, parse_image_line
+from release_bundle import ReleaseBundle
+from reproducible_build import resolve_build_date, normalize_core_properties, document_bytes, write_if_changed
+from terminology import TITLE_TERMINOLOGY, TerminologyNormalizer, load_terminology
+
 class EnhancedDocumentConverter:
     """Enhanced converter for professional Word documents"""
     
-    def __init__(self, source_folder, output_folder=None):
+    def __init__(self, source_folder, output_folder=None, build_date=None, bundle=None, terminology=None):
         self.source_folder = Path(source_folder)
         self.output_folder = Path(output_folder) if output_folder else self.source_folder / "professional_word_documents"
         
-        # Create output directory if it doesn't exist
-        self.output_folder.mkdir(exist_ok=True)
+        # Fixed (or SOURCE_DATE_EPOCH) date makes builds byte-identical
+        self.build_date = resolve_build_date(build_date)
+        
+        # Optional ReleaseBundle: documents are streamed into it instead of written to disk
+        self.bundle = bundle
+        self.output_sizes = {}
+        self.document_date = self.build_date or datetime.now()
+        
+        # Create output directory if it doesn't exist (bundles write nothing there)
+        if bundle is None:
+            self.output_folder.mkdir(exist_ok=True)
+        
+        # Processed images are shared by every document in the batch
+        cache_root = self.output_folder if bundle is None else bundle.archive_path.parent
+        self.image_cache = ImageCache(cache_root / ".image_cache")
+        
+        # Vendor/product spellings normalized in all body text ({canonical: [variants]})
+        self.terminology = TerminologyNormalizer(terminology)
+        
+        # Titles keep the original file-name word list only
+        self.title_terminology = TerminologyNormalizer(TITLE_TERMINOLOGY)
         
     def convert_all_documents_professional(self):
         """Convert all documents with professional formatting"""
@@ -38,7 +65,7 @@ class EnhancedDocumentConverter:
         print()
         
         # Get all files in the source folder
-        for file_path in self.source_folder.iterdir():
+        for file_path in sorted(self.source_folder.iterdir()):
             if file_path.is_file() and not file_path.name.startswith('.'):
                 file_extension = file_path.suffix.lower()
                 
@@ -56,10 +83,12 @@ class EnhancedDocumentConverter:
     def convert_markdown_professional(self, markdown_file):
         """Convert Markdown file to professional Word document"""
         
+        started = time.perf_counter()
         print(f"Converting Markdown: {markdown_file.name}")
+        self.terminology.begin_document(markdown_file.name)
         
         # Read content with encoding fallback
-        content = self.read_file_with_encoding(markdown_file)
+        content, source_sha256 = self.read_file_with_encoding(markdown_file)
         
         # Create professional Word document
         doc = Document()
@@ -72,24 +101,25 @@ class EnhancedDocumentConverter:
         self.add_title_page(doc, markdown_file.stem, "Technical Documentation", "BITMARCK Tender Response")
         
         # Parse content
-        self.parse_markdown_professional(content, doc)
+        self.parse_markdown_professional(content, doc, markdown_file.parent)
         
         # Generate output filename
         output_filename = self.output_folder / f"{markdown_file.stem}_Professional.docx"
         
         # Save document
-        doc.save(output_filename)
-        print(f"✓ Saved: {output_filename.name}")
+        self.save_professional_document(doc, output_filename, markdown_file.stem, markdown_file, source_sha256, started)
         
         return output_filename
     
     def convert_text_professional(self, text_file):
         """Convert text file to professional Word document"""
         
+        started = time.perf_counter()
         print(f"Converting Text: {text_file.name}")
+        self.terminology.begin_document(text_file.name)
         
         # Read content with encoding fallback
-        content = self.read_file_with_encoding(text_file)
+        content, source_sha256 = self.read_file_with_encoding(text_file)
         
         # Create professional Word document
         doc = Document()
@@ -111,26 +141,41 @@ class EnhancedDocumentConverter:
         output_filename = self.output_folder / f"{text_file.stem}_Professional.docx"
         
         # Save document
-        doc.save(output_filename)
-        print(f"✓ Saved: {output_filename.name}")
+        self.save_professional_document(doc, output_filename, title, text_file, source_sha256, started)
         
         return output_filename
     
+    def save_professional_document(self, doc, output_filename, title, source_file, source_sha256, started):
+        """Save document to disk or the release bundle, skipping unchanged outputs"""
+        
+        if self.build_date is not None:
+            normalize_core_properties(doc, self.build_date, title)
+        
+        converted = time.perf_counter()
+        data = document_bytes(doc, self.build_date)
+        timings = {
+            'convert_seconds': converted - started,
+            'serialize_seconds': time.perf_counter() - converted,
+        }
+        self.output_sizes[output_filename] = len(data)
+        
+        if self.bundle is not None:
+            self.bundle.add_document(output_filename.name, data, source_file, source_sha256, timings)
+            print(f"✓ Bundled: {output_filename.name}")
+        elif write_if_changed(output_filename, data, self.build_date):
+            print(f"✓ Saved: {output_filename.name}")
+        else:
+            print(f"= Unchanged: {output_filename.name}")
+        
+        for (original, replacement), count in sorted(self.terminology.summary(Path(source_file).name).items()):
+            print(f"  Terminology: {original} → {replacement} ({count})")
+    
     def read_file_with_encoding(self, file_path):
-        """Read file with multiple encoding attempts"""
+        """Read file with multiple encoding attempts, returning (content, source SHA-256)"""
         
-        encodings = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
-        
-        for encoding in encodings:
-            try:
-                with open(file_path, 'r', encoding=encoding) as f:
-                    return f.read()
-            except UnicodeDecodeError:
-                continue
-        
-        # If all encodings fail, read as binary and decode with errors='ignore'
-        with open(file_path, 'rb') as f:
-            return f.read().decode('utf-8', errors='ignore')
+        # Single read: the bytes are hashed for the release manifest and then decoded
+        # (utf-8, latin-1, cp1252, iso-8859-1, finally utf-8 ignoring errors)
+        return read_source(file_path)
     
     def setup_professional_styles(self, doc):
         """Setup professional document styles"""
@@ -190,7 +235,7 @@ class EnhancedDocumentConverter:
         # Add footer
         footer = doc.sections[0].footer
         footer_para = footer.paragraphs[0]
-        footer_para.text = f"Generated: {datetime.now().strftime('%B %d, %Y')} | Page "
+        footer_para.text = f"Generated: {self.document_date.strftime('%B %d, %Y')} | Page "
         footer_para.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
     
     def add_title_page(self, doc, title, subtitle, organization):
@@ -235,7 +280,7 @@ class EnhancedDocumentConverter:
         info_text = f"""
 Document Type: Technical Specification
 Project: Network Support Services Tender
-Date: {datetime.now().strftime('%B %d, %Y')}
+Date: {self.document_date.strftime('%B %d, %Y')}
 Version: 1.0
         """
         info_run = info_para.add_run(info_text.strip())
@@ -253,25 +298,45 @@ Version: 1.0
         title = filename.replace('_', ' ').replace('-', ' ')
         title = re.sub(r'\s+', ' ', title)  # Multiple spaces to single
         
-        # Capitalize properly
-        words = title.split()
-        formatted_words = []
+        # Capitalize properly, then upper-case LOT (F5 is already upper after title())
+        title = ' '.join(word.title() for word in title.split())
+        
+        return self.title_terminology.normalize(title)
+    
+    def resolve_paragraph_styles(self, doc):
+        """Map paragraph style names used by the parsers to style IDs, once per document"""
+        
+        return {name: doc.styles[name].style_id for name in ('CustomHeading1', 'CustomHeading2', 'CodeBlock', 'List Bullet', 'List Number')}
+    
+    def add_styled_paragraph(self, doc, text, style_id):
+        """Add a paragraph with a style ID from resolve_paragraph_styles"""
         
-        for word in words:
-            if word.lower() in ['lot', 'network', 'support', 'services', 'cisco', 'palo', 'alto', 'f5']:
-                formatted_words.append(word.upper() if word.lower() in ['lot', 'f5'] else word.title())
-            else:
-                formatted_words.append(word.title())
+        paragraph = doc.add_paragraph(text)
         
-        return ' '.join(formatted_words)
+        # Assigning paragraph.style scans every style for the default on each call;
+        # writing the already resolved w:pStyle does not
+        paragraph._p.style = style_id
+        return paragraph
     
-    def parse_markdown_professional(self, content, doc):
+    def parse_markdown_professional(self, content, doc, base_path=None):
         """Parse markdown with professional formatting"""
         
+        styles = self.resolve_paragraph_styles(doc)
         lines = content.split('\n')
+        code_block = False
         
-        for line in lines:
-            line = line.strip()
+        for raw_line in lines:
+            line = raw_line.strip()
+            
+            # Code blocks (fence lines toggle, contents keep their indentation)
+            if line.startswith('```'):
+                code_block = not code_block
+                continue
+            
+            if code_block:
+                if line:
+                    self.add_styled_paragraph(doc, raw_line.rstrip(), styles['CodeBlock'])
+                continue
             
             if not line:
                 continue
@@ -279,12 +344,12 @@ Version: 1.0
             # Headers
             if line.startswith('#'):
                 level = len(line) - len(line.lstrip('#'))
-                header_text = line.lstrip('#').strip()
+                header_text = self.terminology.normalize(line.lstrip('#').strip())
                 
                 if level == 1:
-                    para = doc.add_paragraph(header_text, style='CustomHeading1')
+                    para = self.add_styled_paragraph(doc, header_text, styles['CustomHeading1'])
                 elif level == 2:
-                    para = doc.add_paragraph(header_text, style='CustomHeading2')
+                    para = self.add_styled_paragraph(doc, header_text, styles['CustomHeading2'])
                 else:
                     para = doc.add_paragraph()
                     run = para.add_run(header_text)
@@ -292,22 +357,34 @@ Version: 1.0
                     run.font.size = Pt(12)
                 continue
             
-            # Code blocks
-            if line.startswith('```'):
+            # Images and diagrams
+            image = parse_image_line(line)
+            if image:
+                alt_text, target = image
+                if not self.image_cache.add_picture(doc, target, base_path, alt_text):
+                    para = doc.add_paragraph()
+                    run = para.add_run(alt_text or target)
+                    run.italic = True
+                    run.font.color.rgb = RGBColor(0x4F, 0x81, 0xBD)
+                    
+                    # Hidden copy of the markdown source so the importer can restore it
+                    source_run = para.add_run(f"![{alt_text}]({target})")
+                    source_run.font.hidden = True
                 continue
             
             # Lists
             if line.startswith(('- ', '* ', '+ ')) or re.match(r'^\d+\.\s', line):
-                list_text = re.sub(r'^[-*+]\s*|^\d+\.\s*', '', line)
-                doc.add_paragraph(list_text, style='List Bullet' if line.startswith(('- ', '* ', '+ ')) else 'List Number')
+                list_text = self.terminology.normalize(re.sub(r'^[-*+]\s*|^\d+\.\s*', '', line))
+                self.add_styled_paragraph(doc, list_text, styles['List Bullet'] if line.startswith(('- ', '* ', '+ ')) else styles['List Number'])
                 continue
             
             # Regular paragraph
-            doc.add_paragraph(line)
+            doc.add_paragraph(self.terminology.normalize(line))
     
     def parse_text_professional(self, content, doc, title):
         """Parse text content with professional formatting"""
         
+        styles = self.resolve_paragraph_styles(doc)
         lines = content.split('\n')
         
         # Add table of contents placeholder
@@ -321,31 +398,31 @@ Version: 1.0
         current_section = None
         
         for line in lines:
-            line = line.strip()
+            line = self.terminology.normalize(line.strip())
             
             if not line:
                 continue
             
             # Detect section headers (various patterns)
             if self.is_section_header(line):
-                para = doc.add_paragraph(line, style='CustomHeading1')
+                para = self.add_styled_paragraph(doc, line, styles['CustomHeading1'])
                 current_section = line
                 continue
             
             # Detect subsections
             if self.is_subsection_header(line):
-                para = doc.add_paragraph(line, style='CustomHeading2')
+                para = self.add_styled_paragraph(doc, line, styles['CustomHeading2'])
                 continue
             
             # Detect lists
             if line.startswith(('- ', '* ', '• ', '○ ')):
                 list_text = re.sub(r'^[-*•○]\s*', '', line)
-                doc.add_paragraph(list_text, style='List Bullet')
+                self.add_styled_paragraph(doc, list_text, styles['List Bullet'])
                 continue
             
             if re.match(r'^\d+[\.)]\s', line):
                 list_text = re.sub(r'^\d+[\.)]\s*', '', line)
-                doc.add_paragraph(list_text, style='List Number')
+                self.add_styled_paragraph(doc, list_text, styles['List Number'])
                 continue
             
             # Questions or important items
@@ -385,16 +462,31 @@ Version: 1.0
 def main():
     """Main function for enhanced conversion"""
     
+    parser = argparse.ArgumentParser(description="Enhanced Professional Document Converter")
+    parser.add_argument("--bundle", help="Stream all documents into this release archive (.zip) with a manifest")
+    parser.add_argument("--terminology", help="JSON terminology dictionary ({canonical: [variants]})")
+    args = parser.parse_args()
+    
     source_folder = "/Users/adiscato/Python/TENDER"
     
     print("🔄 Enhanced Professional Document Converter")
     print("=" * 50)
     
-    converter = EnhancedDocumentConverter(source_folder)
+    bundle = None
     
     try:
+        # Opened inside the try so a bad --bundle path takes the normal error path
+        bundle = ReleaseBundle(args.bundle, resolve_build_date()) if args.bundle else None
+        
+        terminology = load_terminology(args.terminology) if args.terminology else None
+        converter = EnhancedDocumentConverter(source_folder, bundle=bundle, terminology=terminology)
+        
         converted_files = converter.convert_all_documents_professional()
         
+        # Finish the archive (manifest and central directory) before reporting
+        if bundle is not None:
+            bundle.close()
+        
         print("\n✅ Conversion Complete!")
         print(f"Successfully converted {len(converted_files)} files:")
         print()
@@ -402,18 +494,28 @@ def main():
         for file_path in converted_files:
             print(f"  📄 {file_path.name}")
         
-        print(f"\n📁 All professional Word documents saved to:")
-        print(f"   {converter.output_folder}")
+        if bundle is not None:
+            print(f"\n📦 All professional Word documents bundled into:")
+            print(f"   {bundle.archive_path}")
+        else:
+            print(f"\n📁 All professional Word documents saved to:")
+            print(f"   {converter.output_folder}")
         
-        # File size information
+        # File size information (recorded while saving, no second pass over the output)
         print(f"\n📊 File Information:")
         for file_path in converted_files:
-            size_mb = file_path.stat().st_size / (1024 * 1024)
+            size_mb = converter.output_sizes[file_path] / (1024 * 1024)
             print(f"  {file_path.name}: {size_mb:.2f} MB")
         
+        print(f"\n🔤 Terminology substitutions: {len(converter.terminology.substitutions)}")
+        
     except Exception as e:
         print(f"❌ Error during conversion: {str(e)}")
         sys.exit(1)
+    finally:
+        # Always leave a readable archive, even after a failed conversion
+        if bundle is not None:
+            bundle.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
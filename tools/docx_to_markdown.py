@@ -0,0 +1,463 @@
+#!/usr/bin/env python3
+"""
+Word to Markdown Importer
+Streams reviewer-edited professional Word documents (.docx) back into
+markdown and diffs them against the original LOT-*.md sources
+"""
+
+import argparse
+import difflib
+import re
+import sys
+import zipfile
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+from image_cache import parse_image_line
+from terminology import TerminologyNormalizer, load_terminology
+
+W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+WP_NS = '{http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing}'
+
+# Paragraph styles written by EnhancedDocumentConverter -> block kind
+STYLE_KINDS = {
+    'CustomHeading1': 'heading1',
+    'CustomHeading2': 'heading2',
+    'CodeBlock': 'code',
+    'List Bullet': 'bullet',
+    'List Number': 'number',
+}
+
+# Consecutive blocks of these kinds are not separated by blank lines
+GROUPED_KINDS = ('code', 'bullet', 'number', 'table')
+
+BLOCK_PREFIXES = {
+    'heading1': '# ',
+    'heading2': '## ',
+    'heading3': '### ',
+    'bullet': '- ',
+    'number': '1. ',
+}
+
+# Level 3+ headings are written as a single bold 12pt run (24 half-points)
+HEADING3_SIZE = '24'
+
+
+def render_block(kind, text):
+    """Markdown line for a block (code fences are added by the caller)"""
+
+    return BLOCK_PREFIXES.get(kind, '') + text
+
+
+def iter_source_blocks(content):
+    """Yield (kind, text, line_index) for a markdown source
+
+    Mirrors EnhancedDocumentConverter.parse_markdown_professional, so source
+    blocks compare equal to the blocks imported from an unedited document.
+    """
+
+    code_block = False
+
+    for index, raw_line in enumerate(content.split('\n')):
+        line = raw_line.strip()
+
+        if line.startswith('```'):
+            code_block = not code_block
+            continue
+
+        if code_block:
+            if line:
+                yield 'code', raw_line.rstrip(), index
+            continue
+
+        if not line:
+            continue
+
+        if line.startswith('#'):
+            level = len(line) - len(line.lstrip('#'))
+            kind = 'heading1' if level == 1 else 'heading2' if level == 2 else 'heading3'
+            yield kind, line.lstrip('#').strip(), index
+        elif parse_image_line(line):
+            alt_text, target = parse_image_line(line)
+            yield 'image', f"![{alt_text}]({target})", index
+        elif line.startswith(('- ', '* ', '+ ')):
+            yield 'bullet', re.sub(r'^[-*+]\s*', '', line), index
+        elif re.match(r'^\d+\.\s', line):
+            yield 'number', re.sub(r'^\d+\.\s*', '', line), index
+        else:
+            yield 'paragraph', line, index
+
+
+class ProfessionalDocumentImporter:
+    """Import professional Word documents back into markdown"""
+
+    def __init__(self, docx_path, skip_title_page=True, terminology=None):
+        self.docx_path = Path(docx_path)
+
+        # Same dictionary as the converter, so normalized spellings are not reported as edits
+        self.terminology = TerminologyNormalizer(terminology)
+
+        # The converter always writes a title page ending in a page break
+        self.skip_title_page = skip_title_page
+
+    def read_style_names(self, package):
+        """Map style IDs to style names (Word may rename IDs, not names)"""
+
+        style_names = {}
+        with package.open('word/styles.xml') as styles_xml:
+            for style in ET.parse(styles_xml).getroot().iter(f'{W_NS}style'):
+                name = style.find(f'{W_NS}name')
+                if name is not None:
+                    style_names[style.get(f'{W_NS}styleId')] = name.get(f'{W_NS}val')
+        return style_names
+
+    def iter_blocks(self):
+        """Yield (kind, text) for each body block, streaming word/document.xml
+
+        Each top-level body element is converted and discarded as soon as it
+        has been parsed, so memory stays flat regardless of document length.
+        """
+
+        with zipfile.ZipFile(self.docx_path) as package:
+            style_names = self.read_style_names(package)
+
+            with package.open('word/document.xml') as document_xml:
+                body = None
+                depth = 0
+                in_content = not self.skip_title_page
+
+                for event, element in ET.iterparse(document_xml, events=('start', 'end')):
+                    if event == 'start':
+                        depth += 1
+                        if depth == 2 and element.tag == f'{W_NS}body':
+                            body = element
+                        continue
+
+                    depth -= 1
+                    if depth != 2 or body is None:
+                        continue
+
+                    if element.tag == f'{W_NS}p':
+                        block = self.paragraph_block(element, style_names)
+                        if block is not None:
+                            if block[0] == 'pagebreak':
+                                in_content = True
+                            elif in_content:
+                                yield block
+                    elif element.tag == f'{W_NS}tbl' and in_content:
+                        yield from self.table_blocks(element)
+
+                    body.remove(element)
+
+    def paragraph_block(self, paragraph, style_names):
+        """Convert one w:p element to a (kind, text) block, or None if empty"""
+
+        style_id = None
+        paragraph_properties = paragraph.find(f'{W_NS}pPr')
+        if paragraph_properties is not None:
+            paragraph_style = paragraph_properties.find(f'{W_NS}pStyle')
+            if paragraph_style is not None:
+                style_id = paragraph_style.get(f'{W_NS}val')
+        kind = STYLE_KINDS.get(style_names.get(style_id, style_id), 'paragraph')
+
+        # Images carry their markdown source on the drawing properties
+        doc_pr = paragraph.find(f'.//{WP_NS}docPr')
+        if doc_pr is not None:
+            return 'image', f"![{doc_pr.get('descr', '')}]({doc_pr.get('name', '')})"
+
+        runs = []
+        page_break = False
+        for run in paragraph.iter(f'{W_NS}r'):
+            text = []
+            for child in run:
+                if child.tag == f'{W_NS}t':
+                    text.append(child.text or '')
+                elif child.tag == f'{W_NS}tab':
+                    text.append('\t')
+                elif child.tag == f'{W_NS}br':
+                    if child.get(f'{W_NS}type') == 'page':
+                        page_break = True
+                    else:
+                        text.append(' ')
+            if text:
+                runs.append((''.join(text), run.find(f'{W_NS}rPr')))
+
+        # Images that could not be embedded keep their markdown in a hidden run
+        for run_text, run_properties in runs:
+            if run_properties is not None and self.is_on(run_properties.find(f'{W_NS}vanish')):
+                image = parse_image_line(run_text.strip())
+                if image:
+                    return 'image', f"![{image[0]}]({image[1]})"
+
+        text = ''.join(run_text for run_text, _ in runs)
+        if page_break and not text.strip():
+            return 'pagebreak', ''
+
+        if kind == 'code':
+            text = text.rstrip()
+            return (kind, text) if text.strip() else None
+
+        text = text.strip()
+        if not text:
+            return None
+
+        if kind == 'paragraph' and self.is_heading3(runs):
+            return 'heading3', text
+
+        if kind in ('paragraph', 'bullet', 'number'):
+            text = self.format_runs(runs).strip()
+
+        return kind, text
+
+    def is_heading3(self, runs):
+        """Detect the bold 12pt paragraphs used for level 3+ headings"""
+
+        for run_text, run_properties in runs:
+            if not run_text.strip():
+                continue
+            if run_properties is None or not self.is_on(run_properties.find(f'{W_NS}b')):
+                return False
+            size = run_properties.find(f'{W_NS}sz')
+            if size is None or size.get(f'{W_NS}val') != HEADING3_SIZE:
+                return False
+        return True
+
+    def is_on(self, toggle):
+        """Whether a w:b / w:i toggle property is set"""
+
+        return toggle is not None and toggle.get(f'{W_NS}val', 'true') not in ('0', 'false')
+
+    def run_marker(self, run_properties):
+        """Markdown delimiter for reviewer-applied bold/italic/code formatting"""
+
+        if run_properties is None:
+            return ''
+
+        fonts = run_properties.find(f'{W_NS}rFonts')
+        if fonts is not None and fonts.get(f'{W_NS}ascii') == 'Consolas':
+            return '`'
+        if self.is_on(run_properties.find(f'{W_NS}b')):
+            return '**'
+        if self.is_on(run_properties.find(f'{W_NS}i')):
+            return '*'
+        return ''
+
+    def format_runs(self, runs):
+        """Join runs, wrapping each stretch of equally formatted runs once"""
+
+        parts = []
+        current_marker = None
+        current_text = []
+
+        for run_text, run_properties in runs + [('', None)]:
+            marker = self.run_marker(run_properties) if run_text else None
+            if marker == current_marker or (run_text and not run_text.strip()):
+                current_text.append(run_text)
+                continue
+
+            text = ''.join(current_text)
+            if current_marker and text.strip():
+                # Keep surrounding spaces outside the delimiters
+                stripped = text.strip()
+                leading = text[:len(text) - len(text.lstrip())]
+                trailing = text[len(text.rstrip()):]
+                parts.append(f"{leading}{current_marker}{stripped}{current_marker}{trailing}")
+            else:
+                parts.append(text)
+
+            current_marker = marker
+            current_text = [run_text]
+
+        return ''.join(parts)
+
+    def table_blocks(self, table):
+        """Convert a w:tbl element to markdown table rows"""
+
+        for row_index, row in enumerate(table.iter(f'{W_NS}tr')):
+            cells = []
+            for cell in row.iter(f'{W_NS}tc'):
+                cell_text = ' '.join(''.join(t.text or '' for t in p.iter(f'{W_NS}t')) for p in cell.iter(f'{W_NS}p'))
+                cells.append(cell_text.strip().replace('|', '\\|'))
+            yield 'table', '| ' + ' | '.join(cells) + ' |'
+            if row_index == 0:
+                yield 'table', '|' + '---|' * len(cells)
+
+    def iter_markdown_lines(self):
+        """Yield the document as markdown lines"""
+
+        previous_kind = None
+        for kind, text in self.iter_blocks():
+            if previous_kind == 'code' and kind != 'code':
+                yield '```'
+            if previous_kind is not None and not (kind == previous_kind and kind in GROUPED_KINDS):
+                yield ''
+            if kind == 'code' and previous_kind != 'code':
+                yield '```'
+            yield render_block(kind, text)
+            previous_kind = kind
+
+        if previous_kind == 'code':
+            yield '```'
+
+    def merge_into_source(self, source_content):
+        """Return the source lines with the document's edits applied
+
+        Blocks are matched after normalization, so unchanged regions keep
+        their original source lines (blank lines, fences, list numbering).
+        """
+
+        source_lines = source_content.split('\n')
+        source_blocks = list(iter_source_blocks(source_content))
+        document_blocks = list(self.iter_blocks())
+
+        source_keys = [
+            (kind, text if kind in ('code', 'image') else self.terminology.normalize(text))
+            for kind, text, _ in source_blocks
+        ]
+        matcher = difflib.SequenceMatcher(None, source_keys, document_blocks, autojunk=False)
+
+        merged = []
+        position = 0
+
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == 'equal':
+                end = source_blocks[i2 - 1][2] + 1
+                merged.extend(source_lines[position:end])
+                position = end
+                continue
+
+            # Inside a fence when replacing code, or inserting right after code
+            if i1 < i2:
+                inside_code = source_blocks[i1][0] == 'code'
+            else:
+                inside_code = i1 > 0 and source_blocks[i1 - 1][0] == 'code'
+
+            # Code lines stay in the source's fence; everything after them goes
+            # after its closing fence
+            leading = document_blocks[j1:j2]
+            trailing = []
+            if inside_code:
+                code_count = next((n for n, (kind, _) in enumerate(leading) if kind != 'code'), len(leading))
+                leading, trailing = leading[:code_count], leading[code_count:]
+
+            if i1 == i2:
+                merged.extend(self.render_inserted(leading, inside_code, merged[-1] if merged else ''))
+
+            # Keep the gap lines (blank lines, fences) around replaced blocks
+            for offset, (_, _, index) in enumerate(source_blocks[i1:i2]):
+                merged.extend(source_lines[position:index])
+                position = index + 1
+                if offset == 0:
+                    merged.extend(self.render_inserted(leading, inside_code, merged[-1] if merged else ''))
+
+            if trailing:
+                reopen = None
+                if source_blocks[i2 - 1][0] == 'code':
+                    limit = source_blocks[i2][2] if i2 < len(source_blocks) else len(source_lines)
+                    position, reopen = self.close_fence(source_lines, position, limit, merged)
+                merged.extend(self.render_inserted(trailing, False, merged[-1] if merged else ''))
+                if reopen is not None:
+                    merged.extend(['', reopen])
+
+        merged.extend(source_lines[position:])
+        return merged
+
+    def close_fence(self, source_lines, position, limit, merged):
+        """Copy source lines through the closing code fence after position
+
+        Returns (position, reopen). reopen is the opening fence line to restart
+        the code block with when blocks were inserted in the middle of it,
+        otherwise None. An unterminated fence at the end of the source is closed.
+        """
+
+        for index in range(position, limit):
+            if source_lines[index].strip().startswith('```'):
+                merged.extend(source_lines[position:index + 1])
+                return index + 1, None
+
+        if limit == len(source_lines):
+            merged.extend(source_lines[position:limit])
+            merged.append('```')
+            return limit, None
+
+        # The next source block is still in this fence: split it around the insert
+        merged.append('```')
+        opening = next((line for line in reversed(source_lines[:position]) if line.strip().startswith('```')), '```')
+        return position, opening
+
+    def render_inserted(self, blocks, inside_code, previous_line):
+        """Markdown lines for blocks that are new relative to the source"""
+
+        lines = []
+        in_code = inside_code
+        previous_kind = None
+
+        for kind, text in blocks:
+            if kind == 'code' and not in_code:
+                lines.extend(['', '```'])
+                in_code = True
+            elif kind != 'code' and in_code and not inside_code:
+                lines.append('```')
+                in_code = False
+
+            # Separate new blocks by a blank line, except list items and code lines
+            last_line = lines[-1] if lines else previous_line
+            grouped = kind == previous_kind and kind in GROUPED_KINDS
+            if kind != 'code' and not inside_code and not grouped and last_line.strip():
+                lines.append('')
+
+            lines.append(render_block(kind, text))
+            previous_kind = kind
+
+        if in_code and not inside_code:
+            lines.append('```')
+        return lines
+
+    def diff_against_source(self, source_file):
+        """Yield a unified diff from the source markdown to the document"""
+
+        source_file = Path(source_file)
+        source_content = source_file.read_text(encoding='utf-8')
+
+        yield from difflib.unified_diff(
+            source_content.split('\n'),
+            self.merge_into_source(source_content),
+            fromfile=str(source_file),
+            tofile=f"{source_file} (from {self.docx_path.name})",
+            lineterm='',
+        )
+
+
+def main():
+    """Import a reviewed Word document back into markdown"""
+
+    parser = argparse.ArgumentParser(description="Word to Markdown Importer")
+    parser.add_argument("docx", help="Reviewed *_Professional.docx file")
+    parser.add_argument("--source", help="Original markdown source to diff against")
+    parser.add_argument("--write", action="store_true", help="Apply the reviewer edits to --source in place")
+    parser.add_argument("--terminology", help="JSON terminology dictionary used for the conversion")
+    args = parser.parse_args()
+
+    terminology = load_terminology(args.terminology) if args.terminology else None
+    importer = ProfessionalDocumentImporter(args.docx, terminology=terminology)
+
+    try:
+        if not args.source:
+            for line in importer.iter_markdown_lines():
+                print(line)
+        elif args.write:
+            source_file = Path(args.source)
+            merged = importer.merge_into_source(source_file.read_text(encoding='utf-8'))
+            source_file.write_text('\n'.join(merged), encoding='utf-8')
+            print(f"✓ Updated: {source_file.name}")
+        else:
+            for line in importer.diff_against_source(args.source):
+                print(line)
+
+    except Exception as e:
+        print(f"❌ Error during import: {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Image Cache
+Resolves markdown images, downscales them to the page width once and keeps
+the results in a content-addressed on-disk cache shared by all documents
+"""
+
+import hashlib
+import os
+import re
+import shutil
+from pathlib import Path
+
+from docx.shared import Emu
+
+from checksums import hash_file
+
+try:
+    from PIL import Image
+except ImportError:
+    # Without Pillow images are embedded as-is (still cached and deduplicated)
+    Image = None
+
+# Whole-line markdown image: ![alt](path "optional title")
+IMAGE_PATTERN = re.compile(r'^!\[([^\]\n]*)\]\(\s*<?([^\s<>()]+)>?(?:\s+"[^"\n]*")?\s*\)$')
+
+EMU_PER_INCH = 914400
+
+
+def parse_image_line(line):
+    """Return (alt_text, target) if the line is a markdown image, else None"""
+
+    match = IMAGE_PATTERN.match(line)
+    if not match:
+        return None
+    return match.group(1).strip(), match.group(2)
+
+
+class ImageCache:
+    """Content-addressed cache of page-width images"""
+
+    def __init__(self, cache_folder, dpi=150, jpeg_quality=85):
+        self.cache_folder = Path(cache_folder)
+        self.dpi = dpi
+        self.jpeg_quality = jpeg_quality
+
+        # (path, size, mtime) -> source hash, so a repeated image is read only once
+        self._source_hashes = {}
+
+        # Cache key -> processed file, so repeated images skip the disk lookup
+        self._processed = {}
+
+    def resolve_image_path(self, target, base_path):
+        """Resolve a markdown image target relative to the source document"""
+
+        if re.match(r'^[a-zA-Z][a-zA-Z0-9+.-]*://', target):
+            # Remote images are not fetched
+            return None
+
+        image_path = Path(target)
+        if not image_path.is_absolute() and base_path is not None:
+            image_path = Path(base_path) / image_path
+
+        return image_path if image_path.is_file() else None
+
+    def source_hash(self, image_path):
+        """Hash of an image source, memoized while the file is unchanged"""
+
+        resolved = image_path.resolve()
+        stat = resolved.stat()
+        memo_key = (resolved, stat.st_size, stat.st_mtime_ns)
+
+        if memo_key not in self._source_hashes:
+            self._source_hashes[memo_key] = hash_file(resolved)
+        return self._source_hashes[memo_key]
+
+    def get_processed_image(self, image_path, max_width_px):
+        """Return the cached, downscaled copy of an image"""
+
+        source_hash = self.source_hash(image_path)
+        key = hashlib.sha256(
+            f"{source_hash}:{max_width_px}:{self.dpi}:{self.jpeg_quality}:{Image is not None}".encode()
+        ).hexdigest()
+
+        if key in self._processed:
+            return self._processed[key]
+
+        self.cache_folder.mkdir(parents=True, exist_ok=True)
+
+        # Only complete files count; leftover .tmp files are never returned
+        suffix = image_path.suffix.lower() or '.img'
+        candidates = [f"{key}.jpg", f"{key}.png"] if Image is not None else [f"{key}{suffix}"]
+        cached = next((self.cache_folder / name for name in candidates if (self.cache_folder / name).is_file()), None)
+        if cached is None:
+            cached = self._process_image(image_path, key, max_width_px)
+
+        self._processed[key] = cached
+        return cached
+
+    def _process_image(self, image_path, key, max_width_px):
+        """Downscale and recompress an image into the cache"""
+
+        suffix = image_path.suffix.lower() or '.img'
+
+        if Image is None:
+            cached = self.cache_folder / f"{key}{suffix}"
+            temp_path = cached.with_name(cached.name + '.tmp')
+            try:
+                shutil.copyfile(image_path, temp_path)
+                os.replace(temp_path, cached)
+            finally:
+                temp_path.unlink(missing_ok=True)
+            return cached
+
+        # Image.open only reads the header; pixels are decoded on demand
+        with Image.open(image_path) as img:
+            source_format = img.format
+
+            # thumbnail() lets the JPEG decoder scale down while decoding (draft)
+            # and halves other formats with reduce() before the final resample
+            img.thumbnail((max_width_px, max(img.height, 1)), Image.LANCZOS, reducing_gap=2.0)
+
+            # Stamp the target DPI so Word's native size is exactly the intended width
+            if source_format == 'JPEG':
+                cached = self.cache_folder / f"{key}.jpg"
+                save_options = {'format': 'JPEG', 'quality': self.jpeg_quality, 'optimize': True}
+                if img.mode not in ('RGB', 'L'):
+                    img = img.convert('RGB')
+            else:
+                cached = self.cache_folder / f"{key}.png"
+                save_options = {'format': 'PNG', 'optimize': True}
+                if img.mode not in ('1', 'L', 'LA', 'P', 'RGB', 'RGBA'):
+                    img = img.convert('RGBA')
+            save_options['dpi'] = (self.dpi, self.dpi)
+
+            temp_path = cached.with_name(cached.name + '.tmp')
+            try:
+                img.save(temp_path, **save_options)
+                os.replace(temp_path, cached)
+            finally:
+                temp_path.unlink(missing_ok=True)
+
+        return cached
+
+    def add_picture(self, doc, target, base_path, alt_text=''):
+        """Embed a markdown image scaled to the page width
+
+        Returns False if the image could not be resolved or read.
+        """
+
+        image_path = self.resolve_image_path(target, base_path)
+        if image_path is None:
+            print(f"  Warning: image not found: {target}")
+            return False
+
+        section = doc.sections[-1]
+        available_width = section.page_width - section.left_margin - section.right_margin
+        max_width_px = max(1, int(available_width * self.dpi / EMU_PER_INCH))
+
+        try:
+            processed = self.get_processed_image(image_path, max_width_px)
+
+            # Native size comes from the stamped DPI; python-docx stores
+            # identical image bytes as a single media part
+            shape = doc.add_picture(str(processed))
+
+            # Unprocessed images (no Pillow) keep their own DPI, so cap them to the page
+            if shape.width > available_width:
+                shape.height = Emu(shape.height * available_width // shape.width)
+                shape.width = available_width
+
+            # Keep the markdown source on the drawing so it can be imported back;
+            # python-docx has no public API for the drawing name/description (wp:docPr)
+            doc_pr = shape._inline.docPr
+            doc_pr.set('name', target)
+            doc_pr.set('descr', alt_text)
+        except Exception as e:
+            print(f"  Warning: could not embed image {target}: {str(e)}")
+            return False
+
+        return True
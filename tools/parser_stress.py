@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Parser Stress Corpus
+Runs the markdown and text parsers against adversarial inputs with time
+limits, so a single malformed export cannot stall a batch build
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from docx import Document
+
+from convert_to_word import DocumentConverter
+from convert_to_word_professional import EnhancedDocumentConverter
+from docx_to_markdown import ProfessionalDocumentImporter
+
+# Characters per adversarial line (and roughly per multi-line input)
+INPUT_SIZE = 20000
+
+# Hard limit for a single parse of one corpus entry; generous so slow CI
+# machines pass (the slowest entry takes under 1s), runaway parses still fail
+TIME_LIMIT_SECONDS = 5.0
+
+# Doubling the input may at most roughly double the time (plus noise)
+GROWTH_LIMIT = 3.0
+GROWTH_NOISE_SECONDS = 0.05
+
+# Source for the Word -> markdown round trip checks
+ROUND_TRIP_SOURCE = '\n'.join([
+    '# Round Trip', '', 'Intro paragraph.', '',
+    '```bash', 'show version', 'show interfaces', '```', '',
+    'Closing paragraph.', '',
+])
+
+
+def build_corpus(size):
+    """Adversarial inputs of roughly the given size"""
+
+    pipeline = 'kubectl get pods | grep -v Running | awk \'{print $1}\' | xargs kubectl delete pod'
+    table_row = '| APIC | 10.0.0.1 | `show version` |'
+
+    return {
+        'stars': '*' * size,
+        'double stars': '**' * (size // 2),
+        'unclosed bold': '**' + 'a' * size,
+        'alternating italic': '*a' * (size // 2),
+        'trailing stars': 'a*' * (size // 2),
+        'backticks': '`' * size,
+        'unclosed code': '`' + 'x ' * (size // 2),
+        'mixed delimiters': '*`|' * (size // 3),
+        'pipes': '|' * size,
+        'hashes': '#' * size,
+        'list markers': '- ' * (size // 2),
+        'pipeline lines': '\n'.join(pipeline for _ in range(size // len(pipeline))),
+        'table rows': '\n'.join(
+            ['| Component | Address | Command |', '|---|:---:|---:|']
+            + [table_row] * (size // len(table_row))
+        ),
+        'unterminated fence': '```bash\n' + '\n'.join(
+            '# step | grep *x* `y`' for _ in range(size // 24)
+        ),
+        'image-like': '![' * (size // 2),
+    }
+
+
+def make_parsers(work_folder):
+    """All parsers under test, each taking text and returning a new document"""
+
+    basic = DocumentConverter(work_folder, work_folder)
+    professional = EnhancedDocumentConverter(work_folder, work_folder)
+
+    def basic_markdown(text):
+        doc = Document()
+        basic.parse_markdown_to_word(text, doc)
+        return doc
+
+    def basic_text(text):
+        doc = Document()
+        basic.parse_text_to_word(text, doc)
+        return doc
+
+    def professional_markdown(text):
+        doc = Document()
+        professional.setup_professional_styles(doc)
+        professional.parse_markdown_professional(text, doc)
+        return doc
+
+    def professional_text(text):
+        doc = Document()
+        professional.setup_professional_styles(doc)
+        professional.parse_text_professional(text, doc, 'Stress')
+        return doc
+
+    return {
+        'basic markdown': basic_markdown,
+        'basic text': basic_text,
+        'professional markdown': professional_markdown,
+        'professional text': professional_text,
+    }
+
+
+def time_parse(parse, text):
+    """Seconds taken to parse text"""
+
+    start = time.perf_counter()
+    parse(text)
+    return time.perf_counter() - start
+
+
+def check_timings(parsers):
+    """Run every parser over the corpus at two sizes and check time limits"""
+
+    failures = []
+    small_corpus = build_corpus(INPUT_SIZE // 2)
+    large_corpus = build_corpus(INPUT_SIZE)
+
+    for parser_name, parse in parsers.items():
+        for case_name, large_text in large_corpus.items():
+            small_seconds = time_parse(parse, small_corpus[case_name])
+            large_seconds = time_parse(parse, large_text)
+
+            status = 'ok'
+            if large_seconds > TIME_LIMIT_SECONDS:
+                status = f'over {TIME_LIMIT_SECONDS:.1f}s limit'
+            elif large_seconds > GROWTH_LIMIT * small_seconds + GROWTH_NOISE_SECONDS:
+                status = 'superlinear growth'
+
+            print(f"  {parser_name:22} {case_name:20} {small_seconds:7.3f}s {large_seconds:7.3f}s  {status}")
+            if status != 'ok':
+                failures.append(f"{parser_name} / {case_name}: {status}")
+
+    return failures
+
+
+def check_structure(parsers):
+    """Check that adversarial inputs produce the expected document structure"""
+
+    failures = []
+
+    doc = parsers['basic markdown']('Run:\ncat hosts | sort | uniq\nps aux | grep nginx')
+    if doc.tables:
+        failures.append('shell pipelines detected as a table')
+
+    doc = parsers['basic markdown']('| A | B | C |\n|---|---|---|\n| 1 | 2 | 3 |\n| 4 | | 6 |')
+    if len(doc.tables) != 1 or len(doc.tables[0].rows) != 3 or len(doc.tables[0].columns) != 3:
+        failures.append('markdown table not parsed as a 3x3 table')
+
+    doc = parsers['basic markdown']('| A | B | C |\n|---|---|---|\n| 1 | 2 |\n| 4 | 5 | 6 | 7 |\n| 8 | 9 | 10 |')
+    cells = [[cell.text for cell in row.cells] for row in doc.tables[0].rows] if len(doc.tables) == 1 else None
+    if cells != [['A', 'B', 'C'], ['1', '2', ''], ['4', '5', '6'], ['8', '9', '10']]:
+        failures.append(f"short and long table rows not padded/truncated to the header: {cells}")
+
+    doc = parsers['basic markdown']('| Command | Use |\n|---|---|\n| `a \\| b` | pipe |')
+    cells = [[cell.text for cell in row.cells] for row in doc.tables[0].rows] if len(doc.tables) == 1 else None
+    if cells != [['Command', 'Use'], ['`a | b`', 'pipe']]:
+        failures.append(f"escaped pipe split a table cell: {cells}")
+
+    doc = parsers['basic markdown']('| A | B |\n|---|---|\n| 1 | 2 |\n\nps aux | grep nginx | wc -l')
+    if len(doc.tables) != 1 or len(doc.tables[0].rows) != 2:
+        failures.append('shell pipeline after a blank line swallowed into the table')
+
+    doc = parsers['basic markdown']('**bold** and *italic* and `code` with a stray *')
+    runs = doc.paragraphs[0].runs
+    if [run.text for run in runs] != ['bold', ' and ', 'italic', ' and ', 'code', ' with a stray *']:
+        failures.append(f"inline formatting split incorrectly: {[run.text for run in runs]}")
+
+    doc = parsers['professional markdown']('```bash\n# not a heading\n- not a list\n```')
+    styles = [paragraph.style.name for paragraph in doc.paragraphs]
+    if styles != ['CodeBlock', 'CodeBlock']:
+        failures.append(f"code block lines not kept as code: {styles}")
+
+    return failures
+
+
+def check_round_trip(work_folder):
+    """Check that reviewer edits in the Word document merge back into the right place"""
+
+    failures = []
+    source_file = Path(work_folder) / 'Round-Trip.md'
+    source_file.write_text(ROUND_TRIP_SOURCE, encoding='utf-8')
+    source_lines = ROUND_TRIP_SOURCE.split('\n')
+    docx_file = EnhancedDocumentConverter(work_folder, work_folder).convert_markdown_professional(source_file)
+
+    if ProfessionalDocumentImporter(docx_file).merge_into_source(ROUND_TRIP_SOURCE) != source_lines:
+        failures.append('unedited round trip changed the source')
+
+    # Reviewer paragraph after the code block, then in the middle of it
+    cases = {
+        'Closing paragraph.': source_lines[:8] + ['', 'Reviewer paragraph.'] + source_lines[8:],
+        'show interfaces': source_lines[:6] + ['```', '', 'Reviewer paragraph.', '', '```bash'] + source_lines[6:],
+    }
+    for before_text, expected in cases.items():
+        edited_file = Path(work_folder) / 'Round-Trip-Edited.docx'
+        doc = Document(docx_file)
+        next(p for p in doc.paragraphs if p.text == before_text).insert_paragraph_before('Reviewer paragraph.')
+        doc.save(edited_file)
+
+        merged = ProfessionalDocumentImporter(edited_file).merge_into_source(ROUND_TRIP_SOURCE)
+        if merged != expected:
+            failures.append(f"paragraph inserted before {before_text!r} merged as {merged}")
+
+    return failures
+
+
+def main():
+    """Run the stress corpus and exit non-zero on any failure"""
+
+    print("=== Parser Stress Corpus ===")
+    print(f"Input size: {INPUT_SIZE} characters, limit {TIME_LIMIT_SECONDS:.1f}s per parse")
+    print()
+
+    with tempfile.TemporaryDirectory() as work_folder:
+        parsers = make_parsers(work_folder)
+        failures = check_timings(parsers) + check_structure(parsers) + check_round_trip(work_folder)
+
+    if failures:
+        print(f"\n{len(failures)} failure(s):")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+
+    print("\nAll parsers within limits.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Release Bundle
+Streams generated Word documents into a single release archive together
+with a JSON manifest, hashing each document while it is written
+"""
+
+import hashlib
+import json
+import zipfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+from reproducible_build import ZIP_EPOCH, resolve_build_date
+
+MANIFEST_NAME = 'manifest.json'
+WRITE_CHUNK_SIZE = 64 * 1024
+
+
+class ReleaseBundle:
+    """Single-pass release archive with a checksum manifest"""
+
+    def __init__(self, archive_path, build_date=None):
+        self.archive_path = Path(archive_path)
+        self.entries = []
+
+        # Same rules as the converters: naive dates are UTC, SOURCE_DATE_EPOCH as fallback
+        self.build_date = resolve_build_date(build_date)
+
+        bundle_date = max(self.build_date, ZIP_EPOCH) if self.build_date is not None else datetime.now(timezone.utc)
+        self.date_time = bundle_date.astimezone(timezone.utc).timetuple()[:6]
+
+        self.archive_path.parent.mkdir(parents=True, exist_ok=True)
+        self.archive = zipfile.ZipFile(self.archive_path, 'w')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _zip_info(self, name, compress_type):
+        """Zip entry with fixed metadata"""
+
+        info = zipfile.ZipInfo(name, date_time=self.date_time)
+        info.compress_type = compress_type
+        info.create_system = 0
+        info.external_attr = 0o644 << 16
+        return info
+
+    def add_document(self, name, data, source_file, source_sha256, timings):
+        """Stream one document into the archive and record it in the manifest
+
+        source_sha256 is the hash of the source bytes the converter already read.
+        """
+
+        digest = hashlib.sha256()
+
+        # .docx files are already deflated, so store them as-is
+        with self.archive.open(self._zip_info(name, zipfile.ZIP_STORED), 'w') as entry:
+            view = memoryview(data)
+            for offset in range(0, len(view), WRITE_CHUNK_SIZE):
+                chunk = view[offset:offset + WRITE_CHUNK_SIZE]
+                digest.update(chunk)
+                entry.write(chunk)
+
+        entry = {
+            'name': name,
+            'source': Path(source_file).name,
+            'source_sha256': source_sha256,
+            'output_sha256': digest.hexdigest(),
+            'size': len(data),
+        }
+
+        # Wall-clock timings would make a reproducible bundle differ on every build
+        if self.build_date is None:
+            entry['timings'] = {key: round(value, 4) for key, value in timings.items()}
+
+        self.entries.append(entry)
+
+    def close(self):
+        """Write the manifest and finalize the archive"""
+
+        if self.archive is None:
+            return
+
+        manifest = {
+            'generated': (self.build_date or datetime.now(timezone.utc)).isoformat(),
+            'document_count': len(self.entries),
+            'total_size': sum(entry['size'] for entry in self.entries),
+            'documents': self.entries,
+        }
+        manifest_data = json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8')
+        self.archive.writestr(self._zip_info(MANIFEST_NAME, zipfile.ZIP_DEFLATED), manifest_data)
+
+        self.archive.close()
+        self.archive = None
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Reproducible Build Helpers
+Saves Word documents (.docx) as byte-identical archives for unchanged inputs
+"""
+
+import io
+import os
+import zipfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Zip timestamps cannot represent anything before 1980
+ZIP_EPOCH = datetime(1980, 1, 1, tzinfo=timezone.utc)
+
+# Word expects the content types part to be the first zip entry
+FIRST_ENTRY = '[Content_Types].xml'
+
+
+def resolve_build_date(build_date=None):
+    """Return the fixed build date, falling back to SOURCE_DATE_EPOCH
+
+    Returns None when neither is set, meaning a normal (non-reproducible) build.
+    """
+
+    if build_date is not None:
+        if build_date.tzinfo is None:
+            build_date = build_date.replace(tzinfo=timezone.utc)
+        return build_date
+
+    epoch = os.environ.get('SOURCE_DATE_EPOCH')
+    if epoch:
+        return datetime.fromtimestamp(int(epoch), tz=timezone.utc)
+
+    return None
+
+
+def normalize_core_properties(doc, build_date, title=None):
+    """Pin core-properties metadata so it does not vary between builds"""
+
+    core_properties = doc.core_properties
+    core_properties.author = 'BITMARCK Network Services'
+    core_properties.last_modified_by = 'BITMARCK Network Services'
+    core_properties.revision = 1
+    core_properties.created = build_date.replace(tzinfo=None)
+    core_properties.modified = build_date.replace(tzinfo=None)
+    core_properties.last_printed = build_date.replace(tzinfo=None)
+    if title is not None:
+        core_properties.title = title
+
+
+def normalize_docx_bytes(data, build_date):
+    """Rewrite a .docx archive with stable entry order and timestamps"""
+
+    zip_date = max(build_date, ZIP_EPOCH).astimezone(timezone.utc)
+    date_time = zip_date.timetuple()[:6]
+
+    output = io.BytesIO()
+    with zipfile.ZipFile(io.BytesIO(data)) as source, \
+            zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED) as target:
+        names = sorted(source.namelist(), key=lambda name: (name != FIRST_ENTRY, name))
+        for name in names:
+            info = zipfile.ZipInfo(name, date_time=date_time)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.create_system = 0
+            info.external_attr = 0o644 << 16
+            target.writestr(info, source.read(name))
+
+    return output.getvalue()
+
+
+def document_bytes(doc, build_date=None):
+    """Serialize a document, normalizing the archive when a build date is given"""
+
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    data = buffer.getvalue()
+
+    if build_date is not None:
+        data = normalize_docx_bytes(data, build_date)
+
+    return data
+
+
+def write_if_changed(output_filename, data, build_date=None):
+    """Write bytes to a file unless it already holds exactly those bytes
+
+    Only reproducible builds (with a build date) are compared; other builds
+    never produce identical bytes and are always written.
+    Returns False if the file was left untouched, True if it was (re)written.
+    """
+
+    output_filename = Path(output_filename)
+
+    # Leave unchanged outputs alone so mtimes, rsync and caches stay valid
+    if build_date is not None and output_filename.exists() and output_filename.stat().st_size == len(data):
+        if output_filename.read_bytes() == data:
+            return False
+
+    output_filename.write_bytes(data)
+    return True
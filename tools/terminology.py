@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Terminology Normalizer
+Rewrites inconsistent vendor/product spellings to their canonical form in a
+single pass over the text (Aho-Corasick multi-pattern matching)
+"""
+
+import json
+from collections import Counter, deque
+from pathlib import Path
+
+# Canonical spelling -> variants to replace (matched case-sensitively, whole words).
+# All-lowercase variants are left out: they are usually package names, hosts or modules.
+DEFAULT_TERMINOLOGY = {
+    'BIG-IP': ['Big-IP', 'Big-Ip', 'BigIP', 'BIGIP', 'Big IP', 'BIG IP'],
+    'PAN-OS': ['PanOS', 'Pan-OS', 'PANOS', 'PanOs', 'Pan OS', 'PAN OS'],
+    'ACI': ['Aci'],
+    'APIC': ['Apic'],
+    'Palo Alto': ['Palo alto', 'PaloAlto'],
+}
+
+# Terms used when formatting file names as titles (LOT, F5; F5 is already title-cased)
+TITLE_TERMINOLOGY = {
+    'LOT': ['Lot'],
+}
+
+# Characters that join a match to a surrounding identifier (f5-sdk, apic-lab, x.panos, admin@apic)
+TOKEN_CHARACTERS = '-_./@:'
+
+# Of those, characters that still end a word when followed by whitespace (sentence punctuation)
+PUNCTUATION_CHARACTERS = '.:'
+
+
+def load_terminology(terminology_file):
+    """Load a {canonical: [variants]} terminology dictionary from JSON"""
+
+    with open(terminology_file, 'r', encoding='utf-8') as f:
+        terminology = json.load(f)
+
+    if not isinstance(terminology, dict) or not all(
+        isinstance(variants, list) and all(isinstance(variant, str) for variant in variants)
+        for variants in terminology.values()
+    ):
+        raise ValueError(f"{Path(terminology_file).name}: expected an object of canonical term -> list of variant strings")
+
+    return terminology
+
+
+class TerminologyNormalizer:
+    """Single-pass multi-pattern terminology replacement"""
+
+    def __init__(self, terminology=None):
+        terminology = DEFAULT_TERMINOLOGY if terminology is None else terminology
+
+        # Variant -> canonical spelling
+        self.replacements = {}
+        for canonical, variants in terminology.items():
+            for variant in variants:
+                if variant and variant != canonical:
+                    self.replacements[variant] = canonical
+
+        # Every substitution made, for reporting
+        self.substitutions = []
+        self.document = None
+
+        self._build_automaton()
+
+    def _build_automaton(self):
+        """Build the goto, failure and dictionary-suffix links"""
+
+        self._goto = [{}]
+        self._output = [None]
+
+        for variant in self.replacements:
+            state = 0
+            for char in variant:
+                if char not in self._goto[state]:
+                    self._goto.append({})
+                    self._output.append(None)
+                    self._goto[state][char] = len(self._goto) - 1
+                state = self._goto[state][char]
+            self._output[state] = variant
+
+        self._fail = [0] * len(self._goto)
+        self._dict_link = [0] * len(self._goto)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fail = self._goto[fail].get(char, 0)
+                if fail == next_state:
+                    fail = 0
+
+                self._fail[next_state] = fail
+                self._dict_link[next_state] = fail if self._output[fail] else self._dict_link[fail]
+                queue.append(next_state)
+
+    def begin_document(self, document):
+        """Attribute subsequent substitutions to a document"""
+
+        self.document = document
+
+    def find_matches(self, text, skip_code_spans=True):
+        """Return non-overlapping (start, end, variant) matches, leftmost-longest"""
+
+        if not self.replacements:
+            return []
+
+        candidates = []
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        dict_link = self._dict_link
+        state = 0
+
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+
+            node = state if output[state] else dict_link[state]
+            while node:
+                variant = output[node]
+                start = index - len(variant) + 1
+                end = index + 1
+
+                # Whole tokens only: not inside "sha256f5", "f5-sdk" or "admin@apic"
+                if self.is_token_start(text, start) and self.is_token_end(text, end):
+                    candidates.append((start, end, variant))
+                node = dict_link[node]
+
+        if not candidates:
+            return []
+
+        code_spans = self.code_spans(text) if skip_code_spans else []
+
+        matches = []
+        last_end = 0
+        span_index = 0
+        for start, end, variant in sorted(candidates, key=lambda match: (match[0], -match[1])):
+            if start < last_end:
+                continue
+
+            # Leave `inline code` untouched
+            while span_index < len(code_spans) and code_spans[span_index][1] <= start:
+                span_index += 1
+            if span_index < len(code_spans) and code_spans[span_index][0] < end:
+                continue
+
+            matches.append((start, end, variant))
+            last_end = end
+
+        return matches
+
+    def is_token_start(self, text, start):
+        """Whether a match may start here without splitting an identifier"""
+
+        if start == 0:
+            return True
+        previous = text[start - 1]
+        return not previous.isalnum() and previous not in TOKEN_CHARACTERS
+
+    def is_token_end(self, text, end):
+        """Whether a match may end here without splitting an identifier"""
+
+        if end == len(text):
+            return True
+        following = text[end]
+        if following.isalnum():
+            return False
+        if following in PUNCTUATION_CHARACTERS:
+            # "BIG-IP." ends a sentence, "BIG-IP.local" continues a name
+            return end + 1 == len(text) or text[end + 1].isspace()
+        return following not in TOKEN_CHARACTERS
+
+    def code_spans(self, text):
+        """(start, end) ranges of backtick-delimited inline code"""
+
+        spans = []
+        opening = text.find('`')
+        while opening != -1:
+            closing = text.find('`', opening + 1)
+            if closing == -1:
+                break
+            spans.append((opening, closing + 1))
+            opening = text.find('`', closing + 1)
+        return spans
+
+    def normalize(self, text, skip_code_spans=True):
+        """Return text with every variant replaced by its canonical spelling"""
+
+        matches = self.find_matches(text, skip_code_spans)
+        if not matches:
+            return text
+
+        parts = []
+        position = 0
+        for start, end, variant in matches:
+            parts.append(text[position:start])
+            parts.append(self.replacements[variant])
+            position = end
+
+            self.substitutions.append({
+                'document': self.document,
+                'original': variant,
+                'replacement': self.replacements[variant],
+            })
+
+        parts.append(text[position:])
+        return ''.join(parts)
+
+    def summary(self, document=None):
+        """Count substitutions as (original, replacement) pairs"""
+
+        return Counter(
+            (substitution['original'], substitution['replacement'])
+            for substitution in self.substitutions
+            if document is None or substitution['document'] == document
+        )